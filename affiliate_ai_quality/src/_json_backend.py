@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+JSON backend selection for the Orchestrator CLI
+Uses the fastest installed library: orjson > rapidjson > ujson > json
+"""
+
+import importlib
+from typing import Any, Callable, Tuple
+
+BACKEND_NAMES = ("orjson", "rapidjson", "ujson", "json")
+
+def _import_backend(names: Tuple[str, ...] = BACKEND_NAMES):
+    """Return (name, module) for the first importable backend"""
+    for name in names:
+        try:
+            return name, importlib.import_module(name)
+        except ImportError:
+            continue
+    raise ImportError(f"No JSON backend available from {names}")
+
+def _make_dumps(name: str, module: Any) -> Callable[..., bytes]:
+    """Build dumps(obj, indent=True, append_newline=False) -> UTF-8 bytes for a backend"""
+    if name == "orjson":
+        def dumps(obj: Any, indent: bool = True, append_newline: bool = False) -> bytes:
+            option = module.OPT_NON_STR_KEYS
+            if indent:
+                option |= module.OPT_INDENT_2
+            if append_newline:
+                option |= module.OPT_APPEND_NEWLINE
+            return module.dumps(obj, option=option)
+        return dumps
+
+    kwargs = {"ensure_ascii": False}
+    if name == "ujson":
+        kwargs["escape_forward_slashes"] = False
+
+    def dumps(obj: Any, indent: bool = True, append_newline: bool = False) -> bytes:
+        text = module.dumps(obj, indent=2, **kwargs) if indent else module.dumps(obj, **kwargs)
+        if append_newline:
+            text += "\n"
+        return text.encode('utf-8')
+    return dumps
+
+BACKEND, _backend = _import_backend()
+
+# Every backend accepts bytes directly, so no decode step is needed
+loads: Callable[[Any], Any] = _backend.loads
+dumps = _make_dumps(BACKEND, _backend)
+
+# orjson's error subclasses json.JSONDecodeError; the others subclass ValueError
+JSONDecodeError = getattr(_backend, "JSONDecodeError", ValueError)
@@ -5,74 +5,276 @@ Processes affiliate content through evaluation pipeline
 """
 
 import json
-import argparse
+import hashlib
+import importlib.util
+import os
 import sys
+import time
+from bisect import bisect_right
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-import jsonschema
-from typing import Dict, Any, List
+from types import SimpleNamespace
+from typing import Dict, Any, List, Callable, Iterable, Optional
+
+import _json_backend
+
+try:
+    import simdjson
+except ImportError:  # large inputs go through _json_backend as well
+    simdjson = None
+
+try:
+    import fastjsonschema
+except ImportError:  # fall back to the pure-Python jsonschema validator
+    fastjsonschema = None
+
+# jsonschema is only imported when it is the validator actually in use
+if fastjsonschema is not None:
+    _VALIDATION_ERRORS = (fastjsonschema.JsonSchemaValueException,)
+else:
+    from jsonschema import ValidationError
+    _VALIDATION_ERRORS = (ValidationError,)
+
+# Compiled fastjsonschema validators are persisted so that repeated one-shot
+# CLI runs (e.g. from the n8n cron workflow) skip code generation. None means
+# $XDG_CACHE_HOME/affiliate_ai (default ~/.cache), resolved on first use.
+_VALIDATOR_CACHE_DIR: Optional[Path] = None
+
+# Validators built once per schema object and reused for the whole process.
+# The schema itself is kept alongside so its id() cannot be recycled.
+_VALIDATORS: Dict[int, tuple] = {}
+
+# Inputs larger than this are parsed with simdjson when it is installed;
+# below it the per-call overhead outweighs the SIMD parsing speed.
+_SIMDJSON_MIN_BYTES = 65536
+
+# Batches at least this large are scored column-wise with NumPy (if installed)
+_VECTORIZE_MIN_BATCH = 64
+
+# One simdjson parser per process so its internal buffers are reused
+_PARSER = simdjson.Parser() if simdjson is not None else None
+
+# Flags understood by the fast command-line parser; anything else
+# (--help, usage errors, abbreviations) is handed to argparse.
+_VALUE_FLAGS = {
+    '--input': 'input',
+    '-i': 'input',
+    '--output': 'output',
+    '-o': 'output',
+    '--batch': 'batch'
+}
+_SWITCH_FLAGS = {
+    '--verbose': 'verbose',
+    '-v': 'verbose',
+    '--validate-only': 'validate_only',
+    '--skip-output-validation': 'skip_output_validation'
+}
+
+# Upper bound on input files read concurrently in --batch mode
+_BATCH_CONCURRENCY = 32
+
+# Grade ladder: _GRADE_NAMES[bisect_right(_GRADE_THRESH, total_score)]
+_GRADE_NAMES = ("POOR", "FAIR", "GOOD", "EXCELLENT", "ELITE")
+_GRADE_THRESH = (60, 80, 100, 114)
+
+# Prototype for per-link results; copied and filled in for each ASP link
+_LINK_RESULT_TMPL = {
+    "original_url": None,
+    "status": "valid",
+    "redirect_count": 0,
+    "response_time_ms": 250
+}
+
+def _write_stdout(payload: bytes) -> None:
+    """Write bytes to stdout, bypassing the text layer when there is one"""
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        sys.stdout.write(payload.decode('utf-8'))
+        return
+    sys.stdout.flush()  # keep ordering with anything already printed
+    buffer.write(payload)
+
+def _parse_input(raw: bytes) -> Any:
+    """Parse an input document, using simdjson for large payloads"""
+    if _PARSER is not None and len(raw) > _SIMDJSON_MIN_BYTES:
+        return _PARSER.parse(raw, recursive=True)
+    return _json_backend.loads(raw)
+
+@lru_cache(maxsize=16)
+def _load_schema_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a schema file; keyed by mtime so edited files are re-read"""
+    return _json_backend.loads(Path(path_str).read_bytes())
 
 def load_schema(schema_path: Path) -> Dict[str, Any]:
-    """Load JSON schema from file"""
+    """Load JSON schema from file (memoized; do not mutate the result)"""
     try:
-        with open(schema_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+        return _load_schema_cached(str(schema_path), schema_path.stat().st_mtime_ns)
+    except (FileNotFoundError, _json_backend.JSONDecodeError) as e:
         print(f"Error loading schema {schema_path}: {e}", file=sys.stderr)
         sys.exit(1)
 
+def _validator_cache_dir() -> Optional[Path]:
+    """Return the validator cache directory, or None if no safe location exists"""
+    if _VALIDATOR_CACHE_DIR is not None:
+        return _VALIDATOR_CACHE_DIR
+    try:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    except RuntimeError:  # no HOME and no passwd entry (e.g. container cron UIDs)
+        return None
+    cache_dir = Path(base) / "affiliate_ai"
+    # Never write and execute generated modules relative to the working directory
+    return cache_dir if cache_dir.is_absolute() else None
+
+def _load_persisted_validator(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Import the compiled validator module for schema, generating it on first use"""
+    # Match jsonschema's defaults: no format checks, no default injection
+    options = {"use_default": False, "use_formats": False}
+    cache_dir = _validator_cache_dir()
+    if cache_dir is None:
+        return fastjsonschema.compile(schema, **options)
+    key = json.dumps([fastjsonschema.VERSION, options, schema], sort_keys=True).encode()
+    schema_hash = hashlib.blake2b(key, digest_size=8).hexdigest()
+    module_path = cache_dir / f"validator_{schema_hash}.py"
+    try:
+        if not module_path.exists():
+            code = fastjsonschema.compile_to_code(schema, **options)
+            module_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = module_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(code, encoding='utf-8')
+            tmp_path.replace(module_path)
+        spec = importlib.util.spec_from_file_location(f"_validator_{schema_hash}", module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.validate
+    except (SyntaxError, AttributeError):
+        # Corrupt cached module: remove it so the next run regenerates it
+        try:
+            module_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+    except OSError:
+        pass  # Unwritable cache directory
+    return fastjsonschema.compile(schema, **options)
+
+def _compile_validator(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Build a validate(data) callable for schema"""
+    if fastjsonschema is not None:
+        return _load_persisted_validator(schema)
+    from jsonschema import Draft7Validator
+    Draft7Validator.check_schema(schema)
+    return Draft7Validator(schema).validate
+
+def _get_validator(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Return a cached validate(data) callable for schema, compiling it only once"""
+    entry = _VALIDATORS.get(id(schema))
+    if entry is None:
+        entry = _VALIDATORS[id(schema)] = (schema, _compile_validator(schema))
+    return entry[1]
+
 def validate_input(data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
     """Validate input data against schema"""
     try:
-        jsonschema.validate(instance=data, schema=schema)
+        _get_validator(schema)(data)
         return True
-    except jsonschema.ValidationError as e:
+    except _VALIDATION_ERRORS as e:
         print(f"Input validation error: {e.message}", file=sys.stderr)
         return False
 
-def create_audit_id() -> str:
-    """Generate unique audit ID"""
-    return f"audit_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+def create_audit_id(now: Optional[datetime] = None) -> str:
+    """Generate unique audit ID (defaults to the current local time)"""
+    # Plain integer formatting avoids strftime and, by default, a datetime object
+    if now is None:
+        t = time.localtime()
+        fields = (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec)
+    else:
+        fields = (now.year, now.month, now.day, now.hour, now.minute, now.second)
+    return "audit_%04d%02d%02d%02d%02d%02d" % fields
 
-def mock_evaluate_content(input_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Mock content evaluation (placeholder for actual AI evaluation)"""
-    # This would be replaced with actual AI model calls
-    content_length = len(input_data.get('content', {}).get('body', ''))
-    asp_links_count = len(input_data.get('asp_links', []))
-    
+def _score(content_length, asp_links_count):
+    """Compute (total, seo, content, affiliate, link, user_value, conversion) scores"""
     # Simple mock scoring based on content length and link count
     base_score = min(80, content_length // 20)  # Max 80 from content length
     link_score = min(20, asp_links_count * 5)   # Max 20 from links
     total_score = base_score + link_score
     
-    # Determine grade
-    if total_score >= 114:
-        grade = "ELITE"
-    elif total_score >= 100:
-        grade = "EXCELLENT" 
-    elif total_score >= 80:
-        grade = "GOOD"
-    elif total_score >= 60:
-        grade = "FAIR"
+    return (
+        total_score,
+        min(15, total_score // 8),
+        min(20, content_length // 50),
+        min(20, asp_links_count * 4),
+        min(15, asp_links_count * 3),
+        min(20, content_length // 40),
+        min(15, asp_links_count * 3)
+    )
+
+# numba JIT for _score is opt-in: its import and compile dispatch cost far
+# more than a single plain-Python call on the one-shot CLI path.
+if os.environ.get("AFFILIATE_AI_JIT") == "1":
+    try:
+        from numba import njit
+    except ImportError:  # keep the plain-Python _score
+        pass
     else:
-        grade = "POOR"
+        _score = njit(cache=True)(_score)
+
+def _score_vectorized(content_lengths: List[int], link_counts: List[int]) -> Optional[List[List[int]]]:
+    """Compute _score rows for a whole batch with NumPy, or None if it is unavailable"""
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    
+    cl = np.fromiter(content_lengths, dtype=np.int64, count=len(content_lengths))
+    lc = np.fromiter(link_counts, dtype=np.int64, count=len(link_counts))
+    total = np.minimum(80, cl // 20) + np.minimum(20, lc * 5)
+    columns = (
+        total,
+        np.minimum(15, total // 8),
+        np.minimum(20, cl // 50),
+        np.minimum(20, lc * 4),
+        np.minimum(15, lc * 3),
+        np.minimum(20, cl // 40),
+        np.minimum(15, lc * 3)
+    )
+    # tolist() converts back to plain ints for JSON serialization
+    return np.column_stack(columns).tolist()
+
+def _assemble(asp_links: List[Dict[str, Any]], content_length: int, scores, now: datetime,
+              link_status_iter: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Build one result dict from a _score row, walking asp_links once"""
+    (total_score, seo_optimization, content_quality, affiliate_integration,
+     link_validity, user_value, conversion_potential) = scores
+    grade = _GRADE_NAMES[bisect_right(_GRADE_THRESH, total_score)]
+    
+    # Statuses from a link checker (if any) are merged over the template in the same pass
+    link_statuses = iter(link_status_iter) if link_status_iter is not None else None
+    link_results = [None] * len(asp_links)
+    for i, link in enumerate(asp_links):
+        link_result = _LINK_RESULT_TMPL.copy()
+        link_result["original_url"] = link["url"]
+        if link_statuses is not None:
+            status = next(link_statuses, None)
+            if status is not None:
+                link_result.update(status)
+        link_results[i] = link_result
     
     return {
-        "audit_id": create_audit_id(),
-        "timestamp": datetime.now().isoformat(),
+        "audit_id": create_audit_id(now),
+        "timestamp": now.isoformat(),
         "overall_score": {
             "total": total_score,
             "grade": grade,
             "auto_publish_eligible": total_score >= 114
         },
         "detailed_scores": {
-            "seo_optimization": min(15, total_score // 8),
-            "content_quality": min(20, content_length // 50),
-            "affiliate_integration": min(20, asp_links_count * 4),
-            "link_validity": min(15, asp_links_count * 3),
-            "user_value": min(20, content_length // 40),
+            "seo_optimization": seo_optimization,
+            "content_quality": content_quality,
+            "affiliate_integration": affiliate_integration,
+            "link_validity": link_validity,
+            "user_value": user_value,
             "compliance": 8,  # Mock compliance score
-            "conversion_potential": min(15, asp_links_count * 3),
+            "conversion_potential": conversion_potential,
             "technical_quality": 4  # Mock technical score
         },
         "improvements": [
@@ -83,14 +285,7 @@ def mock_evaluate_content(input_data: Dict[str, Any]) -> Dict[str, Any]:
                 "impact_points": 3
             }
         ],
-        "link_validation_results": [
-            {
-                "original_url": link["url"],
-                "status": "valid",
-                "redirect_count": 0,
-                "response_time_ms": 250
-            } for link in input_data.get('asp_links', [])
-        ],
+        "link_validation_results": link_results,
         "metadata": {
             "evaluator_version": "1.0.0",
             "processing_time_seconds": 1.2,
@@ -99,33 +294,195 @@ def mock_evaluate_content(input_data: Dict[str, Any]) -> Dict[str, Any]:
         }
     }
 
-def main():
+def evaluate_batch(items: List[Dict[str, Any]],
+                   link_statuses: Optional[List[Optional[Iterable[Dict[str, Any]]]]] = None) -> List[Dict[str, Any]]:
+    """Mock content evaluation for a batch of inputs"""
+    # link_statuses optionally holds, per item, an iterable of link checker
+    # results (status, redirect_count, response_time_ms) in asp_links order
+    asp_links_per_item = [item.get('asp_links', ()) for item in items]
+    content_lengths = [len(item.get('content', {}).get('body', '')) for item in items]
+    link_counts = [len(asp_links) for asp_links in asp_links_per_item]
+    
+    scores = None
+    if len(items) >= _VECTORIZE_MIN_BATCH:
+        scores = _score_vectorized(content_lengths, link_counts)
+    if scores is None:
+        scores = [_score(cl, lc) for cl, lc in zip(content_lengths, link_counts)]
+    
+    if link_statuses is None:
+        link_statuses = [None] * len(items)
+    elif len(link_statuses) != len(items):
+        raise ValueError(f"link_statuses has {len(link_statuses)} entries for {len(items)} items")
+    
+    # One clock reading per result, shared by its audit_id and timestamp
+    return [
+        _assemble(asp_links, content_length, row, datetime.now(), statuses)
+        for asp_links, content_length, row, statuses
+        in zip(asp_links_per_item, content_lengths, scores, link_statuses)
+    ]
+
+def mock_evaluate_content(input_data: Dict[str, Any],
+                          link_status_iter: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Mock content evaluation (placeholder for actual AI evaluation)"""
+    # This would be replaced with actual AI model calls
+    return evaluate_batch([input_data], [link_status_iter])[0]
+
+def _resolve_batch_paths(batch: str) -> List[Path]:
+    """Expand a --batch argument (directory or glob pattern) to input files"""
+    import glob
+    batch_dir = Path(batch)
+    if batch_dir.is_dir():
+        return sorted(batch_dir.glob('*.json'))
+    return [Path(p) for p in sorted(glob.glob(batch))]
+
+async def _load_inputs(paths: List[Path], input_schema: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Read, parse and validate input files concurrently; failures are reported and skipped"""
+    import asyncio
+    validate = _get_validator(input_schema)
+    semaphore = asyncio.Semaphore(max(1, min(_BATCH_CONCURRENCY, len(paths))))
+    
+    async def _one(path: Path) -> Dict[str, Any]:
+        async with semaphore:
+            raw = await asyncio.to_thread(path.read_bytes)
+        data = _parse_input(raw)
+        validate(data)
+        return data
+    
+    loaded = await asyncio.gather(*(_one(path) for path in paths), return_exceptions=True)
+    inputs = {}
+    for path, data in zip(paths, loaded):
+        if isinstance(data, _VALIDATION_ERRORS):
+            print(f"Input validation error in {path}: {data.message}", file=sys.stderr)
+        elif isinstance(data, (OSError, ValueError)):
+            print(f"Error loading input file {path}: {data}", file=sys.stderr)
+        elif isinstance(data, BaseException):
+            raise data
+        else:
+            inputs[str(path)] = data
+    return inputs
+
+async def process_batch(paths: List[Path], input_schema: Dict[str, Any],
+                        output_schema: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """Load, validate and evaluate input files in one interpreter, keyed by path"""
+    inputs = await _load_inputs(paths, input_schema)
+    results = dict(zip(inputs, evaluate_batch(list(inputs.values()))))
+    
+    if output_schema is not None:
+        validate_output = _get_validator(output_schema)
+        for path, result in list(results.items()):
+            try:
+                validate_output(result)
+            except _VALIDATION_ERRORS as e:
+                print(f"Output validation error in {path}: {e.message}", file=sys.stderr)
+                del results[path]
+    return results
+
+def _write_result(result: Any, args: SimpleNamespace) -> None:
+    """Write a result to --output or stdout"""
+    # Serialized once; the same bytes feed the verbose digest
+    payload = _json_backend.dumps(result, append_newline=not args.output)
+    if args.output:
+        Path(args.output).write_bytes(payload)
+    else:
+        _write_stdout(payload)
+    if args.verbose:
+        digest = hashlib.blake2b(payload, digest_size=8).hexdigest()
+        print(f"Results written to: {args.output or 'stdout'} "
+              f"({len(payload):,} bytes, blake2b {digest})", file=sys.stderr)
+
+def _run_batch(args: SimpleNamespace, input_schema: Dict[str, Any],
+               output_schema: Optional[Dict[str, Any]]) -> None:
+    """Handle --batch: evaluate every input file and exit 1 if any failed"""
+    # asyncio is imported here so single-input runs do not pay for it
+    import asyncio
+    paths = _resolve_batch_paths(args.batch)
+    if not paths:
+        print(f"No input files found for batch: {args.batch}", file=sys.stderr)
+        sys.exit(1)
+    if args.verbose:
+        print(f"Processing {len(paths)} input files...", file=sys.stderr)
+    
+    if args.validate_only:
+        inputs = asyncio.run(_load_inputs(paths, input_schema))
+        if len(inputs) != len(paths):
+            sys.exit(1)
+        print(f"Validation complete - {len(inputs)} inputs are valid")
+        return
+    
+    results = asyncio.run(process_batch(paths, input_schema, output_schema))
+    _write_result(results, args)
+    if len(results) != len(paths):
+        sys.exit(1)
+
+def _build_arg_parser():
+    """Build the full argparse parser (used for --help and usage errors)"""
+    import argparse
     parser = argparse.ArgumentParser(description="Affiliate Content Quality Orchestrator")
-    parser.add_argument('--input', '-i', required=True, help='Input JSON file path')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input', '-i', help='Input JSON file path')
+    source.add_argument('--batch', help='Directory of input JSON files, or a glob pattern')
     parser.add_argument('--output', '-o', help='Output JSON file path (default: stdout)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     parser.add_argument('--validate-only', action='store_true', help='Only validate input, do not evaluate')
-    
-    args = parser.parse_args()
+    parser.add_argument('--skip-output-validation', action='store_true', default=False,
+                        help='Do not validate the generated result against the output schema')
+    return parser
+
+def _parse_argv(argv: List[str]) -> SimpleNamespace:
+    """Parse command-line arguments without importing argparse in the common case"""
+    values = {
+        'input': None,
+        'output': None,
+        'batch': None,
+        'verbose': False,
+        'validate_only': False,
+        'skip_output_validation': False
+    }
+    args = iter(argv)
+    for arg in args:
+        if arg in _SWITCH_FLAGS:
+            values[_SWITCH_FLAGS[arg]] = True
+            continue
+        if arg.startswith('--') and '=' in arg:
+            flag, _, value = arg.partition('=')
+        else:
+            flag, value = arg, next(args, None) if arg in _VALUE_FLAGS else None
+        if flag in _VALUE_FLAGS and value and not value.startswith('-'):
+            values[_VALUE_FLAGS[flag]] = value
+            continue
+        return _build_arg_parser().parse_args(argv)
+    if (values['input'] is None) == (values['batch'] is None):
+        return _build_arg_parser().parse_args(argv)
+    return SimpleNamespace(**values)
+
+def main():
+    args = _parse_argv(sys.argv[1:])
     
     # Determine schema paths (relative to script location)
     script_dir = Path(__file__).parent.parent.parent
     input_schema_path = script_dir / "docs" / "audit_input_schema.json"
     output_schema_path = script_dir / "docs" / "audit_output_schema.json"
     
+    # The output schema is only needed when a result will be validated
+    check_output = not (args.validate_only or args.skip_output_validation)
+    
     if args.verbose:
         print(f"Loading input schema from: {input_schema_path}", file=sys.stderr)
-        print(f"Loading output schema from: {output_schema_path}", file=sys.stderr)
+        if check_output:
+            print(f"Loading output schema from: {output_schema_path}", file=sys.stderr)
     
     # Load schemas
     input_schema = load_schema(input_schema_path)
-    output_schema = load_schema(output_schema_path)
+    output_schema = load_schema(output_schema_path) if check_output else None
+    
+    if args.batch:
+        _run_batch(args, input_schema, output_schema)
+        return
     
     # Load and validate input
     try:
-        with open(args.input, 'r', encoding='utf-8') as f:
-            input_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+        input_data = _parse_input(Path(args.input).read_bytes())
+    except (FileNotFoundError, ValueError) as e:
         print(f"Error loading input file: {e}", file=sys.stderr)
         sys.exit(1)
     
@@ -146,22 +503,17 @@ def main():
     result = mock_evaluate_content(input_data)
     
     # Validate output against schema
-    try:
-        jsonschema.validate(instance=result, schema=output_schema)
-        if args.verbose:
-            print("Output validation passed", file=sys.stderr)
-    except jsonschema.ValidationError as e:
-        print(f"Output validation error: {e.message}", file=sys.stderr)
-        sys.exit(1)
+    if check_output:
+        try:
+            _get_validator(output_schema)(result)
+            if args.verbose:
+                print("Output validation passed", file=sys.stderr)
+        except _VALIDATION_ERRORS as e:
+            print(f"Output validation error: {e.message}", file=sys.stderr)
+            sys.exit(1)
     
     # Output result
-    if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        if args.verbose:
-            print(f"Results written to: {args.output}", file=sys.stderr)
-    else:
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+    _write_result(result, args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -14,14 +14,32 @@ import os
 # Add the src directory to the path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+import _json_backend
+import orchestrator
 from orchestrator import (
     load_schema, 
     validate_input, 
+    _get_validator,
+    _compile_validator,
+    _score,
+    _parse_input,
+    _write_stdout,
+    _parse_argv,
+    _build_arg_parser,
     create_audit_id, 
     mock_evaluate_content,
+    evaluate_batch,
+    process_batch,
     main
 )
 
+@pytest.fixture(autouse=True)
+def validator_cache_dir(tmp_path):
+    """Keep compiled validator modules out of the real ~/.cache"""
+    cache_dir = tmp_path / "validator_cache"
+    with patch('orchestrator._VALIDATOR_CACHE_DIR', cache_dir):
+        yield cache_dir
+
 @pytest.fixture
 def sample_input_data():
     """Sample input data matching the schema"""
@@ -101,6 +119,38 @@ class TestLoadSchema:
         result = load_schema(schema_file)
         assert result == sample_input_schema
     
+    def test_load_schema_memoized(self, tmp_path, sample_input_schema):
+        """Test that an unchanged schema file is parsed only once"""
+        schema_file = tmp_path / "memo_schema.json"
+        schema_file.write_text(json.dumps(sample_input_schema))
+        
+        first = load_schema(schema_file)
+        assert load_schema(schema_file) is first
+        # The same object keeps the compiled validator cache warm too
+        assert _get_validator(load_schema(schema_file)) is _get_validator(first)
+    
+    def test_load_schema_reloads_modified_file(self, tmp_path):
+        """Test that a modified schema file is re-read"""
+        schema_file = tmp_path / "changing_schema.json"
+        schema_file.write_text(json.dumps({"type": "object"}))
+        assert load_schema(schema_file) == {"type": "object"}
+        
+        schema_file.write_text(json.dumps({"type": "array"}))
+        stat = schema_file.stat()
+        os.utime(schema_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert load_schema(schema_file) == {"type": "array"}
+    
+    @pytest.mark.parametrize("backend", _json_backend.BACKEND_NAMES)
+    def test_load_schema_utf8_bytes(self, tmp_path, backend):
+        """Test that non-ASCII schemas are parsed straight from UTF-8 bytes"""
+        module = pytest.importorskip(backend)
+        schema = {"title": "アフィリエイト記事", "type": "object"}
+        schema_file = tmp_path / "schema_ja.json"
+        schema_file.write_bytes(json.dumps(schema, ensure_ascii=False).encode('utf-8'))
+        
+        with patch('_json_backend.loads', module.loads):
+            assert load_schema(schema_file) == schema
+    
     def test_load_schema_file_not_found(self, tmp_path):
         """Test schema loading with non-existent file"""
         non_existent = tmp_path / "does_not_exist.json"
@@ -116,6 +166,50 @@ class TestLoadSchema:
         with pytest.raises(SystemExit):
             load_schema(invalid_json_file)
 
+class TestJsonBackend:
+    """Test JSON backend selection"""
+    
+    def test_import_backend_falls_back(self):
+        """Test that missing backends are skipped"""
+        name, module = _json_backend._import_backend(("not_a_json_module", "json"))
+        assert name == "json"
+        assert module is json
+    
+    @pytest.mark.parametrize("backend", _json_backend.BACKEND_NAMES)
+    def test_dumps_utf8_indented(self, backend):
+        """Test that every backend emits indented, unescaped UTF-8 bytes"""
+        module = pytest.importorskip(backend)
+        dumps = _json_backend._make_dumps(backend, module)
+        obj = {"url": "https://example.com/a", "title": "ゲーミング"}
+        
+        payload = dumps(obj, append_newline=True)
+        assert isinstance(payload, bytes)
+        assert payload.endswith(b"}\n")
+        assert b'\n  "url"' in payload
+        assert "https://example.com/a".encode('utf-8') in payload
+        assert "ゲーミング".encode('utf-8') in payload
+        assert json.loads(dumps(obj, indent=False)) == obj
+
+class TestParseInput:
+    """Test input document parsing"""
+    
+    def test_parse_input_small(self, sample_input_data):
+        """Test parsing a small input document"""
+        raw = json.dumps(sample_input_data).encode('utf-8')
+        assert _parse_input(raw) == sample_input_data
+    
+    def test_parse_input_large(self, sample_input_data):
+        """Test parsing an input document above the simdjson threshold"""
+        sample_input_data["content"]["body"] = "長文コンテンツ" * 20000
+        raw = json.dumps(sample_input_data, ensure_ascii=False).encode('utf-8')
+        assert len(raw) > orchestrator._SIMDJSON_MIN_BYTES
+        assert _parse_input(raw) == sample_input_data
+    
+    def test_parse_input_invalid(self):
+        """Test that malformed input raises ValueError"""
+        with pytest.raises(ValueError):
+            _parse_input(b"{invalid json" + b" " * 70000)
+
 class TestValidateInput:
     """Test input validation functionality"""
     
@@ -156,6 +250,62 @@ class TestValidateInput:
         result = validate_input(invalid_data, sample_input_schema)
         assert result is False
 
+    def test_validator_is_cached(self, sample_input_schema):
+        """Test that the validator is built once per schema"""
+        assert _get_validator(sample_input_schema) is _get_validator(sample_input_schema)
+
+    @pytest.mark.skipif(orchestrator.fastjsonschema is None, reason="fastjsonschema not installed")
+    def test_compiled_validator_persisted(self, validator_cache_dir, sample_input_data, sample_input_schema):
+        """Test that compiled validators are written once and reloaded from disk"""
+        _compile_validator(sample_input_schema)
+        cached = list(validator_cache_dir.glob("validator_*.py"))
+        assert len(cached) == 1
+        mtime = cached[0].stat().st_mtime_ns
+        validate = _compile_validator(sample_input_schema)
+        assert cached[0].stat().st_mtime_ns == mtime
+        assert validate(sample_input_data) == sample_input_data
+    
+    @pytest.mark.skipif(orchestrator.fastjsonschema is None, reason="fastjsonschema not installed")
+    def test_corrupt_compiled_validator_regenerated(self, validator_cache_dir, sample_input_data, sample_input_schema):
+        """Test that a corrupt cached module is dropped and rebuilt on the next load"""
+        _compile_validator(sample_input_schema)
+        [cached] = validator_cache_dir.glob("validator_*.py")
+        cached.write_text("def validate(:\n")
+        
+        validate = _compile_validator(sample_input_schema)
+        assert validate(sample_input_data) == sample_input_data
+        assert not cached.exists()
+        
+        _compile_validator(sample_input_schema)
+        assert "def validate(data" in cached.read_text()
+
+    def test_validator_without_home_directory(self, monkeypatch, sample_input_data, sample_input_schema):
+        """Test that validation still works when no cache directory can be resolved"""
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+        monkeypatch.setattr(orchestrator, "_VALIDATOR_CACHE_DIR", None)
+        
+        def no_home():
+            raise RuntimeError("Could not determine home directory.")
+        monkeypatch.setattr(orchestrator.Path, "home", staticmethod(no_home))
+        
+        assert orchestrator._validator_cache_dir() is None
+        validate = _compile_validator(sample_input_schema)
+        assert validate(sample_input_data) in (sample_input_data, None)
+    
+    @pytest.mark.parametrize("xdg_cache_home", ["relative", ""])
+    def test_validator_cache_dir_never_relative(self, monkeypatch, tmp_path, xdg_cache_home):
+        """Test that a relative or empty XDG_CACHE_HOME never yields a relative cache dir"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CACHE_HOME", xdg_cache_home)
+        monkeypatch.setattr(orchestrator, "_VALIDATOR_CACHE_DIR", None)
+        monkeypatch.setattr(orchestrator.Path, "home", staticmethod(lambda: tmp_path / "home"))
+        
+        cache_dir = orchestrator._validator_cache_dir()
+        if xdg_cache_home:
+            assert cache_dir is None
+        else:
+            assert cache_dir == tmp_path / "home" / ".cache" / "affiliate_ai"
+
 class TestCreateAuditId:
     """Test audit ID creation"""
     
@@ -167,11 +317,24 @@ class TestCreateAuditId:
         
     def test_create_audit_id_unique(self):
         """Test that audit IDs are unique (at least different timestamps)"""
-        import time
-        id1 = create_audit_id()
-        time.sleep(1)  # Ensure different timestamp
-        id2 = create_audit_id()
+        from datetime import datetime, timedelta
+        now = datetime.now()
+        id1 = create_audit_id(now)
+        id2 = create_audit_id(now + timedelta(seconds=1))
         assert id1 != id2
+    
+    def test_create_audit_id_current_time(self):
+        """Test that the default audit ID uses the current local time"""
+        import time
+        before = time.strftime('%Y%m%d%H%M%S')
+        audit_id = create_audit_id()
+        after = time.strftime('%Y%m%d%H%M%S')
+        assert before <= audit_id[len("audit_"):] <= after
+
+    def test_create_audit_id_from_datetime(self):
+        """Test audit ID derived from a given datetime"""
+        from datetime import datetime
+        assert create_audit_id(datetime(2024, 1, 2, 3, 4, 5)) == "audit_20240102030405"
 
 class TestMockEvaluateContent:
     """Test content evaluation functionality"""
@@ -196,6 +359,37 @@ class TestMockEvaluateContent:
         assert "auto_publish_eligible" in overall
         assert isinstance(overall["total"], int)
         assert overall["grade"] in ["ELITE", "EXCELLENT", "GOOD", "FAIR", "POOR"]
+
+    def test_mock_evaluate_content_audit_id_matches_timestamp(self, sample_input_data):
+        """Test that audit ID and timestamp come from the same clock reading"""
+        result = mock_evaluate_content(sample_input_data)
+        digits = "".join(c for c in result["timestamp"][:19] if c.isdigit())
+        assert result["audit_id"] == f"audit_{digits}"
+    
+    def test_mock_evaluate_content_link_results(self, sample_input_data):
+        """Test that each ASP link gets its own validation result"""
+        sample_input_data["asp_links"].append(dict(sample_input_data["asp_links"][0], url="https://example.com/2"))
+        results = mock_evaluate_content(sample_input_data)["link_validation_results"]
+        assert [r["original_url"] for r in results] == [
+            "https://example.com/affiliate/laptop1",
+            "https://example.com/2"
+        ]
+        assert results[0] is not results[1]
+        assert results[0]["status"] == "valid"
+
+    def test_mock_evaluate_content_link_statuses(self, sample_input_data):
+        """Test that link checker results are merged into link results"""
+        sample_input_data["asp_links"].append(dict(sample_input_data["asp_links"][0], url="https://example.com/2"))
+        statuses = iter([{"status": "redirect", "redirect_count": 2, "response_time_ms": 410}])
+        results = mock_evaluate_content(sample_input_data, statuses)["link_validation_results"]
+        assert results[0] == {
+            "original_url": "https://example.com/affiliate/laptop1",
+            "status": "redirect",
+            "redirect_count": 2,
+            "response_time_ms": 410
+        }
+        # Links without a reported status keep the defaults
+        assert results[1]["status"] == "valid"
     
     def test_mock_evaluate_content_scoring_logic(self):
         """Test scoring logic with different content lengths"""
@@ -223,6 +417,200 @@ class TestMockEvaluateContent:
         # Longer content should generally score higher
         assert long_result["overall_score"]["total"] > short_result["overall_score"]["total"]
 
+class TestScore:
+    """Test the scoring arithmetic"""
+    
+    @pytest.mark.parametrize("content_length,links,total,grade", [
+        (1600, 4, 100, "EXCELLENT"),
+        (1580, 4, 99, "GOOD"),
+        (1200, 4, 80, "GOOD"),
+        (800, 4, 60, "FAIR"),
+        (780, 4, 59, "POOR"),
+        (0, 0, 0, "POOR"),
+    ])
+    def test_score_grade_boundaries(self, sample_input_data, content_length, links, total, grade):
+        """Test totals and grades at each threshold"""
+        sample_input_data["content"]["body"] = "x" * content_length
+        sample_input_data["asp_links"] = sample_input_data["asp_links"] * links
+        overall = mock_evaluate_content(sample_input_data)["overall_score"]
+        assert overall["total"] == total
+        assert overall["grade"] == grade
+    
+    def test_score_detailed_caps(self):
+        """Test that detailed scores are capped at their maximums"""
+        assert tuple(_score(10000, 10)) == (100, 12, 20, 20, 15, 20, 15)
+
+class TestEvaluateBatch:
+    """Test batch evaluation"""
+    
+    @staticmethod
+    def _items(sample_input_data, count):
+        items = []
+        for n in range(count):
+            item = json.loads(json.dumps(sample_input_data))
+            item["content"]["body"] = "x" * (n * 37)
+            item["asp_links"] = item["asp_links"] * (n % 6)
+            items.append(item)
+        return items
+    
+    def test_evaluate_batch_matches_single(self, sample_input_data):
+        """Test that batch results match per-item evaluation"""
+        items = self._items(sample_input_data, 10)
+        for item, result in zip(items, evaluate_batch(items)):
+            expected = mock_evaluate_content(item)
+            assert result["overall_score"] == expected["overall_score"]
+            assert result["detailed_scores"] == expected["detailed_scores"]
+            assert result["link_validation_results"] == expected["link_validation_results"]
+    
+    def test_evaluate_batch_vectorized(self, sample_input_data):
+        """Test that the NumPy path produces the same scores as _score"""
+        pytest.importorskip("numpy")
+        items = self._items(sample_input_data, 80)
+        with patch('orchestrator._VECTORIZE_MIN_BATCH', 1):
+            vectorized = evaluate_batch(items)
+        with patch('orchestrator._VECTORIZE_MIN_BATCH', len(items) + 1):
+            scalar = evaluate_batch(items)
+        assert [r["detailed_scores"] for r in vectorized] == [r["detailed_scores"] for r in scalar]
+        assert [r["overall_score"] for r in vectorized] == [r["overall_score"] for r in scalar]
+        assert all(type(r["overall_score"]["total"]) is int for r in vectorized)
+    
+    def test_evaluate_batch_reads_clock_per_item(self, sample_input_data):
+        """Test that each batch result gets its own audit ID and timestamp"""
+        from datetime import datetime, timedelta
+        start = datetime(2024, 1, 2, 3, 4, 5)
+        readings = iter(start + timedelta(seconds=n) for n in range(3))
+        
+        with patch('orchestrator.datetime') as mock_datetime:
+            mock_datetime.now.side_effect = lambda: next(readings)
+            results = evaluate_batch([sample_input_data] * 3)
+        
+        assert [r["audit_id"] for r in results] == [
+            "audit_20240102030405", "audit_20240102030406", "audit_20240102030407"
+        ]
+        assert [r["timestamp"] for r in results] == [
+            "2024-01-02T03:04:05", "2024-01-02T03:04:06", "2024-01-02T03:04:07"
+        ]
+    
+    def test_evaluate_batch_link_statuses_length_mismatch(self, sample_input_data):
+        """Test that link_statuses must have one entry per item"""
+        with pytest.raises(ValueError):
+            evaluate_batch([sample_input_data] * 3, [None])
+    
+    def test_evaluate_batch_empty(self):
+        """Test that an empty batch yields no results"""
+        assert evaluate_batch([]) == []
+
+class TestParseArgv:
+    """Test command-line parsing"""
+    
+    @pytest.mark.parametrize("argv", [
+        ['--input', 'in.json'],
+        ['-i', 'in.json', '-o', 'out.json', '-v'],
+        ['--input=in.json', '--output=out.json', '--validate-only'],
+        ['--skip-output-validation', '--verbose', '--input', 'in.json'],
+        ['--batch', 'inputs/', '-o', 'out.json'],
+    ])
+    def test_parse_argv_matches_argparse(self, argv):
+        """Test that the fast parser agrees with argparse"""
+        assert vars(_parse_argv(argv)) == vars(_build_arg_parser().parse_args(argv))
+    
+    def test_parse_argv_help_falls_back(self, capsys):
+        """Test that --help is handled by argparse"""
+        with pytest.raises(SystemExit) as exc_info:
+            _parse_argv(['--help'])
+        assert exc_info.value.code == 0
+        assert "--skip-output-validation" in capsys.readouterr().out
+    
+    @pytest.mark.parametrize("argv", [
+        [],
+        ['--input'],
+        ['--input', 'in.json', '--bogus'],
+        ['--input', 'in.json', '--batch', 'inputs/'],
+    ])
+    def test_parse_argv_usage_errors(self, argv):
+        """Test that usage errors exit through argparse"""
+        with pytest.raises(SystemExit) as exc_info:
+            _parse_argv(argv)
+        assert exc_info.value.code == 2
+
+class TestProcessBatch:
+    """Test concurrent batch processing"""
+    
+    def test_process_batch_skips_bad_inputs(self, tmp_path, capsys, sample_input_data, sample_input_schema):
+        """Test that valid files are evaluated and bad ones reported"""
+        import asyncio
+        good = tmp_path / "good.json"
+        good.write_text(json.dumps(sample_input_data))
+        invalid = tmp_path / "invalid.json"
+        invalid.write_text(json.dumps({"content": {}}))
+        malformed = tmp_path / "malformed.json"
+        malformed.write_text("{invalid json")
+        
+        results = asyncio.run(process_batch([good, invalid, malformed], sample_input_schema))
+        
+        assert list(results) == [str(good)]
+        assert results[str(good)]["link_validation_results"][0]["original_url"] == "https://example.com/affiliate/laptop1"
+        err = capsys.readouterr().err
+        assert f"Input validation error in {invalid}" in err
+        assert f"Error loading input file {malformed}" in err
+    
+    def test_main_batch_directory(self, tmp_path, sample_input_data, sample_input_schema):
+        """Test --batch with a directory of inputs"""
+        batch_dir = tmp_path / "inputs"
+        batch_dir.mkdir()
+        for n in range(3):
+            (batch_dir / f"item{n}.json").write_text(json.dumps(sample_input_data))
+        output_file = tmp_path / "output.json"
+        
+        argv = ['orchestrator.py', '--batch', str(batch_dir), '--output', str(output_file),
+                '--skip-output-validation']
+        with patch('sys.argv', argv):
+            with patch('orchestrator.load_schema', return_value=sample_input_schema):
+                main()
+        
+        results = json.loads(output_file.read_text())
+        assert sorted(results) == [str(batch_dir / f"item{n}.json") for n in range(3)]
+    
+    def test_main_batch_no_matches(self, tmp_path, sample_input_schema):
+        """Test --batch with a pattern that matches nothing"""
+        argv = ['orchestrator.py', '--batch', str(tmp_path / "*.json")]
+        with patch('sys.argv', argv):
+            with patch('orchestrator.load_schema', return_value=sample_input_schema):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+        assert exc_info.value.code == 1
+
+class TestImportCost:
+    """Test that optional heavy modules stay out of the single-input CLI path"""
+    
+    @staticmethod
+    def _loaded_modules(tmp_path, argv, names):
+        """Run main() in a fresh interpreter and report which of names were imported"""
+        import subprocess
+        script = (
+            "import sys\n"
+            f"sys.path.insert(0, {str(Path(__file__).parent.parent / 'src')!r})\n"
+            "import orchestrator\n"
+            f"orchestrator._VALIDATOR_CACHE_DIR = orchestrator.Path({str(tmp_path / 'cache')!r})\n"
+            f"sys.argv = ['orchestrator.py'] + {argv!r}\n"
+            "orchestrator.main()\n"
+            f"print(sorted(n for n in {names!r} if n in sys.modules), file=sys.stderr)\n"
+        )
+        proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        assert proc.returncode == 0, proc.stderr
+        return proc.stderr.strip().splitlines()[-1]
+    
+    def test_single_input_skips_heavy_imports(self, tmp_path, sample_input_data):
+        """Test a plain --input run skips argparse, asyncio, numba and the fallback validator"""
+        input_file = tmp_path / "input.json"
+        input_file.write_text(json.dumps(sample_input_data))
+        names = ["argparse", "asyncio", "glob", "numba"]
+        if orchestrator.fastjsonschema is not None:
+            names.append("jsonschema")
+        
+        loaded = self._loaded_modules(tmp_path, ['--input', str(input_file), '-o', str(tmp_path / 'out.json')], names)
+        assert loaded == "[]"
+
 class TestMainFunction:
     """Test main CLI function"""
     
@@ -247,6 +635,61 @@ class TestMainFunction:
                     # Should exit cleanly after validation
                     assert exc_info.value.code is None
     
+    def test_main_skip_output_validation(self, tmp_path, sample_input_data, sample_input_schema):
+        """Test --skip-output-validation does not load the output schema"""
+        input_file = tmp_path / "input.json"
+        input_file.write_text(json.dumps(sample_input_data))
+        output_file = tmp_path / "output.json"
+        
+        argv = ['orchestrator.py', '--input', str(input_file), '--output', str(output_file),
+                '--skip-output-validation']
+        with patch('sys.argv', argv):
+            with patch('orchestrator.load_schema') as mock_load_schema:
+                mock_load_schema.return_value = sample_input_schema
+                main()
+        
+        assert mock_load_schema.call_count == 1
+        assert mock_load_schema.call_args[0][0].name == "audit_input_schema.json"
+        assert json.loads(output_file.read_text())["overall_score"]["total"] > 0
+    
+    def test_main_writes_stdout(self, tmp_path, capsysbinary, sample_input_data, sample_input_schema):
+        """Test that the result is written to stdout as UTF-8 JSON bytes"""
+        input_file = tmp_path / "input.json"
+        input_file.write_text(json.dumps(sample_input_data))
+        
+        argv = ['orchestrator.py', '--input', str(input_file), '--skip-output-validation']
+        with patch('sys.argv', argv):
+            with patch('orchestrator.load_schema', return_value=sample_input_schema):
+                main()
+        
+        out = capsysbinary.readouterr().out
+        assert out.endswith(b"}\n")
+        assert json.loads(out)["link_validation_results"][0]["status"] == "valid"
+    
+    def test_main_verbose_logs_output_digest(self, tmp_path, capsys, sample_input_data, sample_input_schema):
+        """Test that --verbose reports the digest of the bytes actually written"""
+        import hashlib
+        input_file = tmp_path / "input.json"
+        input_file.write_text(json.dumps(sample_input_data))
+        output_file = tmp_path / "output.json"
+        
+        argv = ['orchestrator.py', '-i', str(input_file), '-o', str(output_file),
+                '--skip-output-validation', '--verbose']
+        with patch('sys.argv', argv):
+            with patch('orchestrator.load_schema', return_value=sample_input_schema):
+                main()
+        
+        digest = hashlib.blake2b(output_file.read_bytes(), digest_size=8).hexdigest()
+        assert f"blake2b {digest}" in capsys.readouterr().err
+    
+    def test_write_stdout_without_buffer(self):
+        """Test writing to a text-only stdout replacement"""
+        import io
+        stream = io.StringIO()
+        with patch('sys.stdout', stream):
+            _write_stdout('{"ok": "はい"}\n'.encode('utf-8'))
+        assert stream.getvalue() == '{"ok": "はい"}\n'
+    
     def test_main_missing_input_file(self):
         """Test main with missing input file"""
         with patch('sys.argv', ['orchestrator.py', '--input', '/nonexistent/file.json']):